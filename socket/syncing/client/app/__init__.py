@@ -1,4 +1,5 @@
 from socket import socket, AF_INET, SOCK_STREAM
+from ssl import create_default_context
 from json import load
 from pathlib import Path
 from queue import Queue
@@ -7,6 +8,7 @@ from threading import get_ident
 from .models import Base
 from .collect import Collector
 
+from protocol import recv_exact, TICKET_LENGTH, NO_TICKET, RESUMED, AUTHENTICATED
 from server_client_manager import send_authentication, send_file
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
@@ -35,11 +37,14 @@ class Database:
 
 class Client:
     def __init__(self) -> None:
-        self.socket = socket(AF_INET, SOCK_STREAM)
         data = load(open(DATA_PATH, "r"))
         self.host = data["host"]
         self.port = data["port"]
         self.password = data["password"]
+        # trust the server certificate given in data.json
+        self.context = create_default_context(cafile=data["cert"])
+        self.tls_session = None
+        self.ticket: str = None
         self.queue = Queue()
         self.db = Database(Path("client", "db.db"))
         self.collector = Collector(self.db)
@@ -51,11 +56,33 @@ class Client:
             self.queue.get()
 
     def sync(self) -> None:
-        try:
-            self.socket.connect((self.host, self.port))
-        except ConnectionRefusedError:
-            print("No connection possible ):")
-            return
-        send_authentication(self.socket, self.password)
-        print("Authenticated")
-        send_file(self.socket, self.db.path, send_path=False, send_request_type=False)
+        sock = self.context.wrap_socket(
+            socket(AF_INET, SOCK_STREAM),
+            server_hostname=self.host,
+            session=self.tls_session,
+        )
+        with sock:
+            try:
+                sock.connect((self.host, self.port))
+                if not self.authenticate(sock):
+                    print("NOT Authenticated")
+                    return
+                print("Authenticated")
+                send_file(sock, self.db.path, send_path=False, send_request_type=False)
+            except OSError as e:
+                # refused, TLS errors (ssl.SSLError) and dropped connections
+                print(f"No connection possible ): {e}")
+                return
+            self.tls_session = sock.session
+
+    def authenticate(self, sock: socket) -> bool:
+        # resume with the session ticket, fall back to the password
+        sock.sendall((self.ticket or NO_TICKET).encode())
+        if recv_exact(sock, 1) == RESUMED:
+            return True
+        self.ticket = None
+        send_authentication(sock, self.password)
+        if recv_exact(sock, 1) != AUTHENTICATED:
+            return False
+        self.ticket = recv_exact(sock, TICKET_LENGTH).decode()
+        return True
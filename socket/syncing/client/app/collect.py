@@ -2,15 +2,19 @@ from json import load
 from pathlib import Path
 import os
 
-from .models import add_event
+from .models import File, add_event
+from .ignore import IgnoreMatcher, IGNORE_FILE
+from .watch import Observer
 
-from watchdog.observers import Observer
+from sqlalchemy import or_
 from watchdog.events import (
     FileSystemEventHandler,
     FileModifiedEvent,
     FileMovedEvent,
     FileDeletedEvent,
     FileCreatedEvent,
+    DirMovedEvent,
+    DirDeletedEvent,
 )
 
 
@@ -18,18 +22,68 @@ SYNC_PATH = Path("client", "sync.json")
 
 
 class EventHandler(FileSystemEventHandler):
-    def __init__(self, db) -> None:
+    def __init__(self, db, matcher: IgnoreMatcher, observer: Observer) -> None:
         super().__init__()
         self.db = db
+        self.matcher = matcher
+        self.observer = observer
 
     def on_any_event(self, event):
-        if type(event) in [
+        if type(event) in [DirMovedEvent, DirDeletedEvent]:
+            self.on_dir_event(event)
+            return
+        if type(event) not in [
             FileModifiedEvent,
             FileMovedEvent,
             FileDeletedEvent,
             FileCreatedEvent,
         ]:
-            add_event(event, self.db.session())
+            return
+        for path in [event.src_path, getattr(event, "dest_path", "")]:
+            if os.path.basename(path) == IGNORE_FILE:
+                self.matcher.invalidate(path)
+                self.observer.rescan(os.path.dirname(path))
+        # filter before anything touches the disk or the database
+        src_ignored = self.matcher.is_ignored(event.src_path)
+        if type(event) == FileMovedEvent:
+            dest_ignored = self.matcher.is_ignored(event.dest_path)
+            if src_ignored and dest_ignored:
+                return
+            if src_ignored:
+                event = FileCreatedEvent(event.dest_path)
+            elif dest_ignored:
+                self.delete_recorded(event.src_path)
+                return
+        elif src_ignored:
+            return
+        add_event(event, self.db.session())
+
+    def on_dir_event(self, event):
+        self.matcher.forget(event.src_path)
+        # files inside a moved directory arrive as their own events, only
+        # directories leaving the synced tree need their files deleted
+        if type(event) == DirDeletedEvent or (
+            type(event) == DirMovedEvent
+            and not self.matcher.is_ignored(event.src_path, is_dir=True)
+            and self.matcher.is_ignored(event.dest_path, is_dir=True)
+        ):
+            self.delete_recorded(event.src_path)
+
+    def delete_recorded(self, path: str) -> None:
+        session = self.db.session()
+        files = (
+            session.query(File)
+            .filter(
+                File.exists,
+                or_(
+                    File.path == path,
+                    File.path.startswith(os.path.join(path, ""), autoescape=True),
+                ),
+            )
+            .all()
+        )
+        for file in files:
+            add_event(FileDeletedEvent(file.path), session)
 
 
 class Collector:
@@ -38,7 +92,12 @@ class Collector:
         self.observer = Observer()
         for path in self.paths:
             if os.path.exists(path):
-                self.observer.schedule(EventHandler(db), path, recursive=True)
+                # ignored subtrees are left out of the watch where the
+                # platform allows it, see watch.py
+                matcher = IgnoreMatcher(path)
+                self.observer.schedule_pruned(
+                    EventHandler(db, matcher, self.observer), matcher
+                )
 
     def run(self) -> None:
         self.observer.start()
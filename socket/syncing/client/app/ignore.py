@@ -0,0 +1,202 @@
+import os
+import re
+
+
+IGNORE_FILE = ".syncignore"
+GLOB_CHARS = re.compile(r"[*?\[]")
+
+
+def glob_to_regex(pattern: str) -> str:
+    regex = ""
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+            continue
+        if pattern.startswith("/**", i) and i + 3 == len(pattern):
+            # everything inside, but not the directory itself
+            regex += "/.+"
+            i += 3
+            continue
+        if char == "*":
+            # any other run of stars is a plain "*"
+            while i + 1 < len(pattern) and pattern[i + 1] == "*":
+                i += 1
+            regex += "[^/]*"
+            i += 1
+            continue
+        if char == "?":
+            regex += "[^/]"
+        elif char == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                regex += re.escape(char)
+            else:
+                group = pattern[i + 1 : end].replace("\\", "\\\\")
+                if group.startswith("!"):
+                    group = "^" + group[1:]
+                regex += f"[{group}]"
+                i = end
+        elif char == "\\" and i + 1 < len(pattern):
+            i += 1
+            regex += re.escape(pattern[i])
+        else:
+            regex += re.escape(char)
+        i += 1
+    return regex
+
+
+class RuleSet:
+    def __init__(self) -> None:
+        # literal patterns: anchored paths in a trie, bare names in a dict
+        # (value is dir_only)
+        self.trie = {}
+        self.names = {}
+        self.globs = []
+        self.regex: re.Pattern = None
+
+    def add(self, pattern: str, dir_only: bool) -> None:
+        anchored = "/" in pattern
+        pattern = pattern.lstrip("/")
+        if GLOB_CHARS.search(pattern) is None and "\\" not in pattern:
+            if not anchored:
+                self.names[pattern] = self.names.get(pattern, True) and dir_only
+                return
+            node = self.trie
+            for part in pattern.split("/"):
+                node = node.setdefault(part, {})
+            node[None] = node.get(None, True) and dir_only
+            return
+        regex = glob_to_regex(pattern)
+        if not anchored:
+            regex = "(?:.*/)?" + regex
+        # directories are matched with a trailing "/"
+        regex += "/" if dir_only else "/?"
+        try:
+            re.compile(regex)
+        except re.error:
+            # like git, skip patterns that cannot be parsed (e.g. "[z-a]")
+            return
+        self.globs.append(regex)
+
+    def compile(self) -> None:
+        if self.globs:
+            self.regex = re.compile("|".join(f"(?:{glob})" for glob in self.globs))
+
+    def match(self, parts: list[str], is_dir: bool) -> bool:
+        dir_only = self.names.get(parts[-1])
+        if dir_only is not None and (is_dir or not dir_only):
+            return True
+        node = self.trie
+        for part in parts:
+            node = node.get(part)
+            if node is None:
+                break
+        else:
+            dir_only = node.get(None)
+            if dir_only is not None and (is_dir or not dir_only):
+                return True
+        if self.regex is not None:
+            path = "/".join(parts) + ("/" if is_dir else "")
+            return self.regex.fullmatch(path) is not None
+        return False
+
+
+class IgnoreRules:
+    def __init__(self, lines: list[str]) -> None:
+        # consecutive patterns of the same kind share one compiled RuleSet,
+        # blocks are stored as (negated, rules) in file order
+        self.blocks: list[tuple[bool, RuleSet]] = []
+        for line in lines:
+            line = line.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+            elif line.startswith(("\\#", "\\!")):
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            if not self.blocks or self.blocks[-1][0] != negated:
+                self.blocks.append((negated, RuleSet()))
+            self.blocks[-1][1].add(line, dir_only)
+        for _, rules in self.blocks:
+            rules.compile()
+
+    @staticmethod
+    def load(path: str) -> "IgnoreRules | None":
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                return IgnoreRules(file.readlines())
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def match(self, parts: list[str], is_dir: bool) -> bool | None:
+        # last matching pattern wins, None if no pattern matches
+        for negated, rules in reversed(self.blocks):
+            if rules.match(parts, is_dir):
+                return not negated
+        return None
+
+
+class IgnoreMatcher:
+    def __init__(self, root: str) -> None:
+        self.root = root
+        self.cache: dict[tuple[str, ...], IgnoreRules | None] = {}
+
+    def rules(self, parts: tuple[str, ...]) -> IgnoreRules | None:
+        if parts not in self.cache:
+            self.cache[parts] = IgnoreRules.load(
+                os.path.join(self.root, *parts, IGNORE_FILE)
+            )
+        return self.cache[parts]
+
+    def invalidate(self, path: str) -> None:
+        # path of a changed ignore file
+        parts = self.split(os.path.dirname(path))
+        if parts is not None:
+            self.cache.pop(tuple(parts), None)
+
+    def forget(self, path: str) -> None:
+        # path of a deleted or moved directory
+        parts = self.split(path)
+        if not parts:
+            return
+        prefix = tuple(parts)
+        for key in [key for key in self.cache if key[: len(prefix)] == prefix]:
+            del self.cache[key]
+
+    def split(self, path: str) -> list[str] | None:
+        rel = os.path.relpath(path, self.root)
+        if rel == os.curdir:
+            return []
+        if rel == os.pardir or rel.startswith(os.pardir + os.sep):
+            return None
+        return rel.split(os.sep)
+
+    def is_ignored(self, path: str, is_dir: bool = False) -> bool:
+        parts = self.split(path)
+        if not parts:
+            return False
+        levels = []
+        for end in range(len(parts)):
+            rules = self.rules(tuple(parts[:end]))
+            if rules is not None:
+                levels.append((end, rules))
+            last = end == len(parts) - 1
+            # deeper ignore files override shallower ones
+            ignored = None
+            for start, rules in reversed(levels):
+                ignored = rules.match(parts[start : end + 1], is_dir or not last)
+                if ignored is not None:
+                    break
+            # an ignored directory hides its whole subtree
+            if ignored:
+                return True
+        return False
+
@@ -127,7 +127,9 @@ def add_event(
         session.add(src_file)
         session.commit()
     else:
-        src_file.size = Path(src_file.path).stat().st_size
+        # the file may be gone already (deleted or moved away)
+        src_file.exists = Path(src_file.path).is_file()
+        src_file.size = Path(src_file.path).stat().st_size if src_file.exists else 0
         src_file.change_date = datetime.now()
         # TODO: HERE
     # dest file
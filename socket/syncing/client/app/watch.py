@@ -0,0 +1,180 @@
+import os
+import sys
+from contextlib import suppress
+from errno import ENOTDIR
+from functools import partial
+
+from .ignore import IgnoreMatcher
+
+from watchdog.observers import Observer as DefaultObserver
+from watchdog.observers.api import BaseObserver, DEFAULT_OBSERVER_TIMEOUT
+
+
+# Ignored subtrees are only left unwatched on Linux: inotify watches each
+# directory separately, so the recursive watch can skip ignored ones. Other
+# platforms (ReadDirectoryChangesW, FSEvents) watch a whole tree with one
+# handle and cannot exclude parts of it, there events for ignored paths
+# still arrive and are dropped by EventHandler.
+# This hooks into watchdog's private inotify classes (watchdog 6).
+
+if sys.platform.startswith("linux"):
+    from watchdog.observers.inotify import InotifyEmitter
+    from watchdog.observers.inotify_buffer import InotifyBuffer
+    from watchdog.observers.inotify_c import Inotify, inotify_rm_watch
+    from watchdog.utils import BaseThread
+    from watchdog.utils.delayed_queue import DelayedQueue
+
+    class PrunedInotify(Inotify):
+        # ignored directories get a placeholder descriptor (< -1) instead of
+        # an inotify watch, so watchdog's path bookkeeping still finds them
+        def __init__(
+            self,
+            path: bytes,
+            matcher: IgnoreMatcher,
+            *,
+            recursive: bool = False,
+            event_mask: int | None = None,
+        ) -> None:
+            self.matcher = matcher
+            self.placeholder = -1
+            super().__init__(path, recursive=recursive, event_mask=event_mask)
+
+        def is_ignored(self, path: bytes) -> bool:
+            return self.matcher.is_ignored(os.fsdecode(path), is_dir=True)
+
+        def _add_dir_watch(self, path: bytes, mask: int, *, recursive: bool) -> None:
+            # like Inotify._add_dir_watch, but never walks into ignored
+            # directories
+            if not os.path.isdir(path):
+                raise OSError(ENOTDIR, os.strerror(ENOTDIR), path)
+            self._add_watch(path, mask)
+            if recursive:
+                for root, dirnames, _ in os.walk(path):
+                    dirnames[:] = [
+                        dirname
+                        for dirname in dirnames
+                        if not os.path.islink(os.path.join(root, dirname))
+                        and not self.is_ignored(os.path.join(root, dirname))
+                    ]
+                    for dirname in dirnames:
+                        self._add_watch(os.path.join(root, dirname), mask)
+
+        def _add_watch(self, path: bytes, mask: int) -> int:
+            wd = self._wd_for_path.get(path)
+            if self.is_ignored(path):
+                if wd is not None and wd < -1:
+                    return wd
+                if wd is not None:
+                    inotify_rm_watch(self._inotify_fd, wd)
+                self.placeholder -= 1
+                self._wd_for_path[path] = self.placeholder
+                self._path_for_wd[self.placeholder] = path
+                return self.placeholder
+            if wd is not None and wd < -1:
+                del self._path_for_wd[wd]
+            return super()._add_watch(path, mask)
+
+        def read_events(self, *args, **kwargs):
+            events = super().read_events(*args, **kwargs)
+            with self._lock:
+                for event in events:
+                    if not event.is_directory:
+                        continue
+                    if event.is_delete:
+                        # placeholders get no IN_IGNORED, drop them here
+                        for path, wd in self.watches_under(event.src_path):
+                            if wd < -1:
+                                del self._wd_for_path[path]
+                                del self._path_for_wd[wd]
+                    elif event.is_moved_to and event.src_path in self._wd_for_path:
+                        # renamed in or out of an ignored name
+                        self._rescan(event.src_path)
+            return events
+
+        def watches_under(self, path: bytes) -> list[tuple[bytes, int]]:
+            prefix = os.path.join(path, b"")
+            return [
+                (watched, wd)
+                for watched, wd in self._wd_for_path.items()
+                if watched == path or watched.startswith(prefix)
+            ]
+
+        def rescan(self, path: bytes) -> None:
+            with self._lock:
+                self._rescan(path)
+
+        def _rescan(self, path: bytes) -> None:
+            # unwatch what is ignored now, watch what is not ignored anymore;
+            # directories may vanish while walking
+            with suppress(OSError):
+                for watched, wd in self.watches_under(path):
+                    if wd >= 0 and self.is_ignored(watched):
+                        self._add_watch(watched, self._event_mask)
+                if os.path.isdir(path) and not self.is_ignored(path):
+                    self._add_dir_watch(path, self._event_mask, recursive=True)
+
+    class PrunedInotifyBuffer(InotifyBuffer):
+        def __init__(
+            self,
+            path: bytes,
+            matcher: IgnoreMatcher,
+            *,
+            recursive: bool = False,
+            event_mask: int | None = None,
+        ) -> None:
+            # same as InotifyBuffer.__init__, with PrunedInotify
+            BaseThread.__init__(self)
+            self._queue = DelayedQueue(self.delay)
+            self._inotify = PrunedInotify(
+                path, matcher, recursive=recursive, event_mask=event_mask
+            )
+            self.start()
+
+        def rescan(self, path: bytes) -> None:
+            self._inotify.rescan(path)
+
+    class PrunedInotifyEmitter(InotifyEmitter):
+        def __init__(
+            self, *args, matchers: dict[str, IgnoreMatcher], **kwargs
+        ) -> None:
+            super().__init__(*args, **kwargs)
+            self.matcher = matchers[self.watch.path]
+
+        def on_thread_start(self) -> None:
+            self._inotify = PrunedInotifyBuffer(
+                os.fsencode(self.watch.path),
+                self.matcher,
+                recursive=self.watch.is_recursive,
+                event_mask=self.get_event_mask_from_filter(),
+            )
+
+        def rescan(self, path: str) -> None:
+            # not under self._lock, queue_events blocks on it waiting for events
+            inotify = self._inotify
+            if inotify is not None and self.matcher.split(path) is not None:
+                inotify.rescan(os.fsencode(path))
+
+    class Observer(BaseObserver):
+        def __init__(self, timeout: float = DEFAULT_OBSERVER_TIMEOUT) -> None:
+            self.matchers: dict[str, IgnoreMatcher] = {}
+            super().__init__(
+                partial(PrunedInotifyEmitter, matchers=self.matchers),
+                timeout=timeout,
+            )
+
+        def schedule_pruned(self, event_handler, matcher: IgnoreMatcher):
+            self.matchers[matcher.root] = matcher
+            return self.schedule(event_handler, matcher.root, recursive=True)
+
+        def rescan(self, path: str) -> None:
+            for emitter in list(self.emitters):
+                emitter.rescan(path)
+
+else:
+
+    class Observer(DefaultObserver):
+        def schedule_pruned(self, event_handler, matcher: IgnoreMatcher):
+            return self.schedule(event_handler, matcher.root, recursive=True)
+
+        def rescan(self, path: str) -> None:
+            pass
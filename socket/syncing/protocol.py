@@ -0,0 +1,21 @@
+from socket import socket
+
+
+# shared by client and server, both run.py put this directory on sys.path
+TICKET_LENGTH = 32
+NO_TICKET = "0" * TICKET_LENGTH
+
+RESUMED = b"R"
+PASSWORD = b"P"
+AUTHENTICATED = b"A"
+DENIED = b"D"
+
+
+def recv_exact(sock: socket, length: int) -> bytes:
+    data = b""
+    while len(data) < length:
+        chunk = sock.recv(length - len(data))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        data += chunk
+    return data
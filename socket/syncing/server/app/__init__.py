@@ -1,8 +1,9 @@
 from socket import socket, AF_INET, SOCK_STREAM
+from ssl import SSLContext, PROTOCOL_TLS_SERVER
 from json import load
 from pathlib import Path
 from threading import Thread, get_ident
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from .models import (
     Base,
@@ -15,7 +16,16 @@ from .models import (
     EVENT_CREATED,
 )
 from .models import Client as DBClient
-
+from .tickets import TicketStore
+
+from protocol import (
+    recv_exact,
+    TICKET_LENGTH,
+    RESUMED,
+    PASSWORD,
+    AUTHENTICATED,
+    DENIED,
+)
 from server_client_manager import recv_authentication, recv_file
 from server_client_manager.data import Data
 from werkzeug.security import check_password_hash
@@ -25,6 +35,9 @@ from sqlalchemy.orm import sessionmaker, Session
 
 
 PATH_DATA = Path("server", "data.json")
+TICKET_LIFETIME = 15 * 60
+# seconds a client may stall on any read, handshake included
+CLIENT_TIMEOUT = 30
 
 
 class Database:
@@ -53,34 +66,57 @@ class Client:
         client: socket,
         addr: tuple[str, int],
         password_hash: str,
+        tickets: TicketStore,
+        context: SSLContext,
     ) -> None:
         self.server = server
         self.db_server = db_server
         self.client = client
         self.ip, self.port = addr
         self.password_hash = password_hash
+        self.tickets = tickets
+        self.context = context
         self.data = Data()
         self.db: Database = None
         self.client_db_obj: DBClient = None
 
     def run(self) -> None:
-        # if self.authenticate():
-        # recv database
-        db_path = Path("server", "app", "temp", secure_filename(f"{self.ip}.db"))
-        # recv_file(self.client, path=db_path)
-        self.db = Database(db_path)
-        self.sync()
-
-    def authenticate(self) -> None:
+        try:
+            # handshake in this thread, a stalling peer only blocks itself
+            # until the timeout
+            self.client.settimeout(CLIENT_TIMEOUT)
+            self.client = self.context.wrap_socket(self.client, server_side=True)
+            if not self.authenticate():
+                return
+            # recv database
+            db_path = Path("server", "app", "temp", secure_filename(f"{self.ip}.db"))
+            recv_file(self.client, path=db_path)
+            self.db = Database(db_path)
+            self.sync()
+        except OSError as e:
+            print(f"{self.ip}: {e}")
+        finally:
+            self.client.close()
+
+    def authenticate(self) -> bool:
+        # a valid session ticket skips the password hash entirely
+        # unauthenticated input, must not raise on invalid UTF-8
+        ticket = recv_exact(self.client, TICKET_LENGTH).decode(errors="replace")
+        if self.tickets.check(ticket, self.ip):
+            self.client.sendall(RESUMED)
+            return True
+        self.client.sendall(PASSWORD)
         req = self.client.recv(self.data.REQUEST_LENGHT).decode()
-        self.client.send(self.data.SYNC)
+        self.client.sendall(self.data.SYNC)
         if req != self.data.SEND_AUTHENTICATION:
             return False
         if not check_password_hash(
             self.password_hash, recv_authentication(self.client)
         ):
             print(f"{self.client.getsockname()}: NOT Authenticated")
+            self.client.sendall(DENIED)
             return False
+        self.client.sendall(AUTHENTICATED + self.tickets.issue(self.ip).encode())
         return True
 
     def sync(self) -> None:
@@ -139,6 +175,11 @@ class Server:
         self.host = data["host"]
         self.port = data["port"]
         self.password_hash = data["password_hash"]
+        self.context = SSLContext(PROTOCOL_TLS_SERVER)
+        self.context.load_cert_chain(data["cert"], data["key"])
+        self.tickets = TicketStore(
+            timedelta(seconds=data.get("ticket_lifetime", TICKET_LIFETIME))
+        )
         self.socket = socket(AF_INET, SOCK_STREAM)
         self.data = Data()
         self.db = Database(Path("server", "db.db"))
@@ -147,16 +188,21 @@ class Server:
         self.socket.bind((self.host, self.port))
         self.socket.listen(5)
         while True:
-            # TODO: remove
-            # client, addr = self.socket.accept()
-            client, addr = (None, ("127.0.0.1", 53624))
+            try:
+                client, addr = self.socket.accept()
+            except OSError as e:
+                print(f"Accept failed: {e}")
+                continue
             thread = Thread(
                 target=Client(
-                    self.socket, self.db, client, addr, self.password_hash
+                    self.socket,
+                    self.db,
+                    client,
+                    addr,
+                    self.password_hash,
+                    self.tickets,
+                    self.context,
                 ).run,
                 daemon=True,
             )
             thread.start()
-            # TODO: remove
-            thread.join()
-            break
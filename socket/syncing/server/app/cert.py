@@ -0,0 +1,37 @@
+from ipaddress import ip_address
+from pathlib import Path
+from subprocess import run
+
+
+def generate_cert(name: str, cert_path: Path | str, key_path: Path | str) -> None:
+    # self-signed certificate, the client trusts it directly; name is what
+    # the client connects to, not the address the server binds
+    try:
+        ip_address(name)
+        san = f"IP:{name}"
+    except ValueError:
+        san = f"DNS:{name}"
+    result = run(
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-days",
+            "365",
+            "-subj",
+            f"/CN={name}",
+            "-addext",
+            f"subjectAltName={san}",
+            "-keyout",
+            str(key_path),
+            "-out",
+            str(cert_path),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"openssl failed: {result.stderr.strip()}")
@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta
+from secrets import token_hex
+from threading import Lock
+
+from protocol import TICKET_LENGTH
+
+
+class TicketStore:
+    def __init__(self, lifetime: timedelta) -> None:
+        self.lifetime = lifetime
+        self.tickets: dict[str, tuple[str, datetime]] = {}
+        self.lock = Lock()
+
+    def issue(self, ip: str) -> str:
+        ticket = token_hex(TICKET_LENGTH // 2)
+        now = datetime.now()
+        with self.lock:
+            # forget tickets that were never used again, only on the
+            # (already slow) password path
+            for key, (_, expires) in list(self.tickets.items()):
+                if expires <= now:
+                    del self.tickets[key]
+            self.tickets[ticket] = (ip, now + self.lifetime)
+        return ticket
+
+    def check(self, ticket: str, ip: str) -> bool:
+        with self.lock:
+            entry = self.tickets.get(ticket)
+            if entry is None:
+                return False
+            if entry[1] <= datetime.now():
+                del self.tickets[ticket]
+                return False
+        return entry[0] == ip
@@ -0,0 +1,16 @@
+import sys
+from json import load
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app import PATH_DATA
+from app.cert import generate_cert
+
+
+if len(sys.argv) != 2:
+    print("usage: python server/cert.py <host or ip the clients connect to>")
+    sys.exit(1)
+data = load(open(PATH_DATA, "r"))
+generate_cert(sys.argv[1], data["cert"], data["key"])
+print(f"Copy {Path(data['cert'])} to the client and set it as \"cert\" there")
@@ -0,0 +1,23 @@
+import sys
+from importlib.util import spec_from_file_location, module_from_spec
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+
+def load_app(name: str):
+    # client and server both ship a package called "app"
+    path = ROOT / name / "app"
+    spec = spec_from_file_location(
+        f"{name}_app", path / "__init__.py", submodule_search_locations=[str(path)]
+    )
+    module = module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+load_app("client")
+load_app("server")
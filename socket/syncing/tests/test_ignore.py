@@ -0,0 +1,130 @@
+import os
+
+from client_app.ignore import IgnoreMatcher, IgnoreRules, glob_to_regex
+
+
+def ignored(lines: list[str], path: str, is_dir: bool = False) -> bool:
+    return bool(IgnoreRules(lines).match(path.split("/"), is_dir))
+
+
+def write(path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def test_glob_to_regex():
+    assert glob_to_regex("*.py") == r"[^/]*\.py"
+    assert glob_to_regex("a?c") == "a[^/]c"
+    assert glob_to_regex("**/b") == "(?:.*/)?b"
+    assert glob_to_regex("a/**") == "a/.+"
+    assert glob_to_regex("a**b") == "a[^/]*b"
+    assert glob_to_regex("[!ab]x") == "[^ab]x"
+    assert glob_to_regex(r"\*") == r"\*"
+
+
+def test_names_match_any_level():
+    assert ignored(["node_modules"], "node_modules")
+    assert ignored(["node_modules"], "a/b/node_modules")
+    assert not ignored(["node_modules"], "a/node_modules_old")
+
+
+def test_anchored():
+    assert ignored(["/build"], "build")
+    assert not ignored(["/build"], "src/build")
+    assert ignored(["src/build"], "src/build")
+    assert not ignored(["src/build"], "a/src/build")
+    assert ignored(["src/*.o"], "src/x.o")
+    assert not ignored(["src/*.o"], "a/src/x.o")
+
+
+def test_dir_only():
+    assert ignored(["out/"], "out", is_dir=True)
+    assert not ignored(["out/"], "out")
+    assert ignored(["*.d/"], "x.d", is_dir=True)
+    assert not ignored(["*.d/"], "x.d")
+
+
+def test_globs():
+    assert ignored(["*.swp"], "a/.x.swp")
+    assert not ignored(["*.swp"], "a.swp.txt")
+    assert ignored(["a?c"], "abc")
+    assert not ignored(["a?c"], "a/c")
+    assert ignored(["[ab].txt"], "b.txt")
+    assert not ignored(["[ab].txt"], "c.txt")
+    assert ignored(["[!ab].txt"], "c.txt")
+    assert ignored(["**/tmp/*.o"], "tmp/x.o")
+    assert ignored(["**/tmp/*.o"], "a/b/tmp/x.o")
+    assert ignored(["doc/**/*.pdf"], "doc/a/b/x.pdf")
+    assert ignored(["doc/**/*.pdf"], "doc/x.pdf")
+    assert ignored(["logs/**"], "logs/a/b")
+    assert not ignored(["logs/**"], "logs", is_dir=True)
+    assert not ignored(["logs/**", "!logs/keep"], "logs/keep")
+    assert ignored(["a**b"], "axxb")
+    assert not ignored(["a**b"], "ax/xb")
+
+
+def test_invalid_patterns_are_skipped():
+    assert ignored(["[z-a]", "*.tmp"], "a.tmp")
+    assert not ignored(["[z-a]", "*.tmp"], "z")
+    assert IgnoreRules(["[z-a]"]).match(["z"], False) is None
+
+
+def test_unreadable_ignore_file(tmp_path):
+    (tmp_path / ".syncignore").write_bytes(b"\xff\xfe*.tmp\n")
+    (tmp_path / "sub" / ".syncignore").mkdir(parents=True)
+    matcher = IgnoreMatcher(str(tmp_path))
+    assert not matcher.is_ignored(os.path.join(tmp_path, "a.tmp"))
+    assert not matcher.is_ignored(os.path.join(tmp_path, "sub", "a.tmp"))
+
+
+def test_comments_and_escapes():
+    assert IgnoreRules(["# comment", "", "   "]).match(["# comment"], False) is None
+    assert ignored([r"\#notes"], "#notes")
+    assert ignored([r"\!important"], "!important")
+    assert ignored([r"a\*"], "a*")
+    assert not ignored([r"a\*"], "ab")
+
+
+def test_last_match_wins():
+    assert not ignored(["*.log", "!keep.log"], "keep.log")
+    assert ignored(["*.log", "!keep.log"], "other.log")
+    assert ignored(["!x", "x"], "x")
+    assert not ignored(["x", "!x"], "x")
+    assert ignored(["*.log", "!a.log", "a.*"], "a.log")
+
+
+def test_deeper_file_overrides(tmp_path):
+    write(tmp_path / ".syncignore", "*.log\n")
+    write(tmp_path / "sub" / ".syncignore", "!a.log\n")
+    matcher = IgnoreMatcher(str(tmp_path))
+    assert not matcher.is_ignored(os.path.join(tmp_path, "sub", "a.log"))
+    assert matcher.is_ignored(os.path.join(tmp_path, "sub", "b.log"))
+    assert matcher.is_ignored(os.path.join(tmp_path, "a.log"))
+
+
+def test_ignored_parent_hides_subtree(tmp_path):
+    write(tmp_path / ".syncignore", ".git/\n!HEAD\n")
+    matcher = IgnoreMatcher(str(tmp_path))
+    assert matcher.is_ignored(os.path.join(tmp_path, ".git"), is_dir=True)
+    assert matcher.is_ignored(os.path.join(tmp_path, ".git", "HEAD"))
+    assert not matcher.is_ignored(os.path.join(tmp_path, "HEAD"))
+    assert not matcher.is_ignored(str(tmp_path), is_dir=True)
+
+
+def test_invalidate(tmp_path):
+    write(tmp_path / "sub" / ".syncignore", "*.tmp\n")
+    matcher = IgnoreMatcher(str(tmp_path))
+    path = os.path.join(tmp_path, "sub", "a.tmp")
+    assert matcher.is_ignored(path)
+    write(tmp_path / "sub" / ".syncignore", "")
+    assert matcher.is_ignored(path)
+    matcher.invalidate(os.path.join(tmp_path, "sub", ".syncignore"))
+    assert not matcher.is_ignored(path)
+
+
+def test_forget(tmp_path):
+    matcher = IgnoreMatcher(str(tmp_path))
+    matcher.is_ignored(os.path.join(tmp_path, "tmp", "a", "b"))
+    matcher.is_ignored(os.path.join(tmp_path, "keep", "c"))
+    matcher.forget(os.path.join(tmp_path, "tmp"))
+    assert sorted(matcher.cache) == [(), ("keep",)]
@@ -0,0 +1,228 @@
+from datetime import datetime, timedelta
+from socket import socket, AF_INET, SOCK_STREAM
+from ssl import SSLContext, PROTOCOL_TLS_SERVER, create_default_context
+from threading import Thread
+
+import time
+
+import pytest
+from werkzeug.security import check_password_hash, generate_password_hash
+
+import client_app
+import server_app
+from server_app.cert import generate_cert
+from server_app.tickets import TicketStore
+
+
+HOST = "127.0.0.1"
+PASSWORD = "secret"
+
+
+@pytest.fixture(scope="module")
+def contexts(tmp_path_factory):
+    path = tmp_path_factory.mktemp("cert")
+    generate_cert(HOST, path / "cert.pem", path / "key.pem")
+    server_context = SSLContext(PROTOCOL_TLS_SERVER)
+    server_context.load_cert_chain(path / "cert.pem", path / "key.pem")
+    return server_context, create_default_context(cafile=path / "cert.pem")
+
+
+@pytest.fixture
+def received(monkeypatch):
+    # Client.run past authentication: record the upload, skip the sync
+    uploads = []
+    monkeypatch.setattr(
+        server_app, "recv_file", lambda *args, **kwargs: uploads.append(1)
+    )
+    monkeypatch.setattr(server_app, "Database", lambda path: None)
+    monkeypatch.setattr(server_app.Client, "sync", lambda self: None)
+    return uploads
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    uploads = []
+    monkeypatch.setattr(
+        client_app, "send_file", lambda *args, **kwargs: uploads.append(1)
+    )
+    return uploads
+
+
+@pytest.fixture
+def tickets():
+    return TicketStore(timedelta(minutes=1))
+
+
+@pytest.fixture
+def hash_calls(monkeypatch):
+    calls = []
+
+    def counting(password_hash, password):
+        calls.append(password)
+        return check_password_hash(password_hash, password)
+
+    monkeypatch.setattr(server_app, "check_password_hash", counting)
+    return calls
+
+
+def make_client(context, password: str = PASSWORD, ticket: str = None):
+    client = client_app.Client.__new__(client_app.Client)
+    client.host = HOST
+    client.password = password
+    client.context = context
+    client.tls_session = None
+    client.ticket = ticket
+    client.db = client_app.Database.__new__(client_app.Database)
+    client.db.path = "db.db"
+    return client
+
+
+def serve(contexts, tickets) -> tuple[tuple[str, int], Thread, list]:
+    # one connection handled by server_app.Client.run in its own thread
+    listener = socket(AF_INET, SOCK_STREAM)
+    listener.bind((HOST, 0))
+    listener.listen(1)
+    errors = []
+
+    def target():
+        conn, addr = listener.accept()
+        listener.close()
+        try:
+            server_app.Client(
+                listener,
+                None,
+                conn,
+                addr,
+                generate_password_hash(PASSWORD),
+                tickets,
+                contexts[0],
+            ).run()
+        except BaseException as e:
+            errors.append(e)
+
+    thread = Thread(target=target, daemon=True)
+    thread.start()
+    return listener.getsockname(), thread, errors
+
+
+def sync(contexts, tickets, client) -> None:
+    # client_app.Client.sync against server_app.Client.run
+    address, thread, errors = serve(contexts, tickets)
+    client.port = address[1]
+    client.sync()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert errors == []
+
+
+def test_password_login_issues_ticket(contexts, tickets, hash_calls, received, sent):
+    client = make_client(contexts[1])
+    sync(contexts, tickets, client)
+    assert hash_calls == [PASSWORD]
+    assert received == sent == [1]
+    assert client.ticket is not None
+    assert client.tls_session is not None
+    assert tickets.check(client.ticket, HOST)
+
+
+def test_wrong_password(contexts, tickets, received, sent):
+    client = make_client(contexts[1], password="wrong")
+    sync(contexts, tickets, client)
+    assert received == sent == []
+    assert client.ticket is None
+    assert tickets.tickets == {}
+
+
+def test_resume_skips_password_hash(contexts, tickets, received, monkeypatch):
+    client = make_client(contexts[1])
+    sync(contexts, tickets, client)
+    ticket = client.ticket
+
+    def fail(*args):
+        raise AssertionError("check_password_hash called on resume")
+
+    monkeypatch.setattr(server_app, "check_password_hash", fail)
+    sync(contexts, tickets, client)
+    assert received == [1, 1]
+    assert client.ticket == ticket
+
+
+def test_expired_ticket_rejected(contexts, tickets, hash_calls, received):
+    client = make_client(contexts[1])
+    sync(contexts, tickets, client)
+    old = client.ticket
+    tickets.tickets[old] = (HOST, datetime.now() - timedelta(seconds=1))
+    sync(contexts, tickets, client)
+    assert hash_calls == [PASSWORD, PASSWORD]
+    assert received == [1, 1]
+    assert client.ticket != old
+    assert old not in tickets.tickets
+
+
+def test_ticket_from_other_ip_rejected(contexts, tickets, hash_calls, received):
+    client = make_client(contexts[1], ticket=tickets.issue("10.0.0.1"))
+    sync(contexts, tickets, client)
+    assert hash_calls == [PASSWORD]
+    assert received == [1]
+    assert tickets.check(client.ticket, HOST)
+
+
+def test_untrusted_certificate(contexts, tickets, received, tmp_path):
+    generate_cert(HOST, tmp_path / "other.pem", tmp_path / "other.key")
+    client = make_client(create_default_context(cafile=tmp_path / "other.pem"))
+    sync(contexts, tickets, client)
+    assert received == []
+    assert client.ticket is None
+
+
+def test_connection_refused(contexts, received):
+    client = make_client(contexts[1])
+    with socket(AF_INET, SOCK_STREAM) as unused:
+        unused.bind((HOST, 0))
+        client.port = unused.getsockname()[1]
+    client.sync()
+    assert client.ticket is None
+
+
+def test_stalled_handshake_times_out(contexts, tickets, received, monkeypatch):
+    monkeypatch.setattr(server_app, "CLIENT_TIMEOUT", 0.2)
+    address, thread, errors = serve(contexts, tickets)
+    with socket(AF_INET, SOCK_STREAM) as sock:
+        sock.connect(address)
+        start = time.monotonic()
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+        assert time.monotonic() - start < 2
+    assert errors == []
+    assert received == []
+
+
+def test_stalled_ticket_times_out(contexts, tickets, received, monkeypatch):
+    monkeypatch.setattr(server_app, "CLIENT_TIMEOUT", 0.2)
+    address, thread, errors = serve(contexts, tickets)
+    with contexts[1].wrap_socket(
+        socket(AF_INET, SOCK_STREAM), server_hostname=HOST
+    ) as sock:
+        sock.connect(address)
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+    assert errors == []
+    assert received == []
+
+
+def test_invalid_ticket_bytes(contexts, tickets, received):
+    address, thread, errors = serve(contexts, tickets)
+    with contexts[1].wrap_socket(
+        socket(AF_INET, SOCK_STREAM), server_hostname=HOST
+    ) as sock:
+        sock.connect(address)
+        sock.sendall(b"\xff" * 32)
+        assert sock.recv(1) == b"P"
+    thread.join(timeout=5)
+    assert errors == []
+    assert received == []
+
+
+def test_generate_cert_reports_openssl_error(tmp_path):
+    with pytest.raises(RuntimeError, match="openssl failed: .+"):
+        generate_cert(HOST, tmp_path / "missing" / "c.pem", tmp_path / "k.pem")
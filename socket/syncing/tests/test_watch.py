@@ -0,0 +1,61 @@
+import os
+import sys
+import time
+
+import pytest
+from watchdog.events import FileSystemEventHandler
+
+from client_app.ignore import IgnoreMatcher
+from client_app.watch import Observer
+
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="pruning needs inotify"
+)
+
+
+@pytest.fixture
+def observer(tmp_path):
+    for path in [".git/objects", "src/build", "logs"]:
+        (tmp_path / path).mkdir(parents=True)
+    (tmp_path / ".syncignore").write_text(".git/\nbuild/\nlogs/\n")
+    matcher = IgnoreMatcher(str(tmp_path))
+    observer = Observer()
+    observer.schedule_pruned(FileSystemEventHandler(), matcher)
+    observer.start()
+    time.sleep(0.2)
+    yield observer, matcher
+    observer.stop()
+    observer.join()
+
+
+def watched(observer, root) -> list[str]:
+    inotify = next(iter(observer.emitters))._inotify._inotify
+    return sorted(
+        os.path.relpath(os.fsdecode(path), root)
+        for path, wd in inotify._wd_for_path.items()
+        if wd >= 0
+    )
+
+
+def test_ignored_directories_are_not_watched(observer, tmp_path):
+    observer, _ = observer
+    assert watched(observer, tmp_path) == [".", "src"]
+    (tmp_path / "new" / "build" / "deep").mkdir(parents=True)
+    time.sleep(0.8)
+    assert watched(observer, tmp_path) == [".", "new", "src"]
+
+
+def test_rescan_after_ignore_file_change(observer, tmp_path):
+    observer, matcher = observer
+    (tmp_path / ".syncignore").write_text(".git/\nbuild/\nsrc/\n")
+    matcher.invalidate(str(tmp_path / ".syncignore"))
+    observer.rescan(str(tmp_path))
+    assert watched(observer, tmp_path) == [".", "logs"]
+
+
+def test_rename_into_ignored_name(observer, tmp_path):
+    observer, _ = observer
+    os.rename(tmp_path / "src", tmp_path / "build")
+    time.sleep(0.8)
+    assert watched(observer, tmp_path) == ["."]